@@ -7,28 +7,146 @@ fast track promo URLs and extracts the associated company/university names.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
 import re
+import html
 import json
-import time
 import os
+import gzip
+import sqlite3
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Set
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 import argparse
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import random
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import itertools
+import bisect
+from collections import Counter, defaultdict
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:  # selectolax is optional; fall back to BeautifulSoup
+        HTMLParser = None
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; searches fall back to a thread pool
+    aiohttp = None
+
+try:
+    import orjson
+    _json = orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+    _json = json
+
+# Patterns are compiled once at import time rather than on every response.
+# They run over the page text left once the markup is stripped (see _TAG_RE)
+_EMAIL_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'@(\w+)\.edu',
+    r'@(\w+)\.com',
+    r'@(\w+)\.org',
+    r'university\s+of\s+(\w+)',
+    r'(\w+)\s+university'
+)]
+
+_COMPANY_INDICATORS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Only.*?members who work at ([^,]+)',
+    r'([^,]+) discover a quicker way',
+    r'([^,]+) employees',
+    r'([^,]+) staff'
+)]
+
+# Stripping the head, script and style blocks and then all tags yields the
+# visible body text without building a DOM
+_NON_TEXT_RE = re.compile(rb'<(head|script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(rb'<[^>]+>')
+
+_PROMO_PAGE_MARKER_RE = re.compile(rb'fast track|mileage plan', re.IGNORECASE)
+
+# Lets BeautifulSoup skip everything but the JSON data scripts while parsing
+_SCRIPT_STRAINER = SoupStrainer('script', attrs={'type': 'application/json'})
+
+# Sample codes probed per prefix before sweeping it. Codes are handed out
+# from the low end, so the samples are weighted towards small numbers
+_PREFIX_PROBES = (1, 5, 10, 20, 30, 50)
+
+# How long a prefix liveness verdict is trusted before probing again
+_PREFIX_CACHE_TTL = timedelta(days=7)
+
+_NEXT_DATA_RE = re.compile(rb'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Statuses that settle whether a code is a promo; anything else (errors,
+# throttling) says nothing about it, so it is neither cached nor trusted
+_DEFINITE_STATUSES = (200, 404)
+
+# Fetched pages are reused from the on-disk cache for this long, so repeat
+# runs within a few hours make no requests
+_PAGE_CACHE_TTL = timedelta(hours=6)
+
+# Size of the ranged preview fetched before downloading the rest of a page
+_PREVIEW_BYTES = 32768
+
+# Searched on the raw bytes so the page is never lowercased as a whole
+_EXPIRED_MARKER_RE = re.compile(rb'promotion ended|expired', re.IGNORECASE)
+
+_EXPIRATION_RE = re.compile(rb'promotion ended.*?on\s+(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE)
 
 class AlaskaPromoFinder:
-    def __init__(self, results_file: str = "alaska_promos.json", delay: float = 1.0):
+    _PREFIXES = ("AS23", "CS23", "AS24", "CS24", "AS25", "CS25")
+
+    def __init__(self, results_file: str = "alaska_promos.json", delay: float = 1.0, concurrency: int = 8,
+                 prune_prefixes: bool = True, use_threads: bool = False):
         self.base_url = "https://www.alaskaair.com/promo/"
         self.results_file = results_file
+        self.journal_file = results_file + '.jsonl'
+        results_base = results_file[:-len('.gz')] if results_file.endswith('.gz') else results_file
+        self.prefix_cache_file = os.path.splitext(results_base)[0] + '_prefixes.json'
+        self._journal = None
         self.delay = delay
+        self._backoff = delay
+        self._backoff_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self.concurrency = concurrency
+        self.prune_prefixes = prune_prefixes
+        self.use_threads = use_threads or aiohttp is None
         self.results: Dict[str, Dict] = {}
+        self._company_index: Dict[str, List[str]] = defaultdict(list)
+        self._sorted_codes: List[str] = []
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Connection': 'keep-alive'
+        }
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.session.headers.update(self.headers)
+        
+        # Reuse connections across requests and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=self.concurrency,
+            # Return the final throttling response instead of raising, so
+            # update_backoff still sees the 429/5xx once retries run out
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                              raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        
+        # Opened on first use, so --list and --company never create the file
+        self.page_cache_file = 'alaska_promo_http.sqlite'
+        self._page_cache: Optional[sqlite3.Connection] = None
+        self._page_cache_lock = threading.Lock()
         
         # Setup logging first
         logging.basicConfig(
@@ -48,81 +166,210 @@ class AlaskaPromoFinder:
         """Load previously found results from file"""
         if os.path.exists(self.results_file):
             try:
-                with open(self.results_file, 'r', encoding='utf-8') as f:
-                    self.results = json.load(f)
+                with open(self.results_file, 'rb') as f:
+                    data = f.read()
+                # Accept gzip-compressed results regardless of the file name
+                if data[:2] == _GZIP_MAGIC:
+                    data = gzip.decompress(data)
+                self.results = _json.loads(data)
                 self.logger.info(f"Loaded {len(self.results)} existing results")
             except Exception as e:
                 self.logger.error(f"Error loading results: {e}")
                 self.results = {}
+        
+        # Merge hits journaled by a sweep that did not finish
+        if os.path.exists(self.journal_file):
+            merged = 0
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                        self.results[result['promo_code']] = result
+                        merged += 1
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        continue  # e.g. a partial line from an interrupted write
+            if merged:
+                self.logger.info(f"Merged {merged} results from {self.journal_file}")
+        
+        self.build_index()
+
+    def build_index(self) -> None:
+        """Build the company-name token index and sorted code list from scratch"""
+        self._company_index = defaultdict(list)
+        self._sorted_codes = sorted(self.results)
+        for code in self._sorted_codes:
+            self._index_company(code, self.results[code])
+
+    def _index_company(self, code: str, data: Dict) -> None:
+        """Add a promo's company-name tokens to the index"""
+        company_name = data.get('company_name')
+        if company_name:
+            for token in set(company_name.lower().split()):
+                self._company_index[token].append(code)
+
+    def add_result(self, code: str, result: Dict) -> None:
+        """Store a new hit and keep the lookup structures up to date"""
+        if code not in self.results:
+            bisect.insort(self._sorted_codes, code)
+        self.results[code] = result
+        self._index_company(code, result)
+
+    def append_result(self, result: Dict) -> None:
+        """Durably record a single hit in the append-only journal"""
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self._journal.flush()
 
     def save_results(self) -> None:
         """Save results to file"""
         try:
-            with open(self.results_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(self.results, indent=2, ensure_ascii=False).encode('utf-8')
+            
+            # A .gz results file is stored compressed
+            opener = gzip.open if self.results_file.endswith('.gz') else open
+            with opener(self.results_file, 'wb') as f:
+                f.write(data)
             self.logger.info(f"Saved {len(self.results)} results to {self.results_file}")
+            
+            # Everything journaled is now in the results file
+            if self._journal is None and os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
         except Exception as e:
             self.logger.error(f"Error saving results: {e}")
 
+    def _open_page_cache(self) -> sqlite3.Connection:
+        """Open the page cache, creating it on first use"""
+        if self._page_cache is None:
+            # Shared by the worker threads; every access holds _page_cache_lock
+            self._page_cache = sqlite3.connect(self.page_cache_file, check_same_thread=False)
+            self._page_cache.execute('CREATE TABLE IF NOT EXISTS pages '
+                                     '(url TEXT PRIMARY KEY, status INTEGER, body BLOB, encoding TEXT, fetched TEXT)')
+        return self._page_cache
+
+    def get_cached_page(self, url: str) -> Optional[Tuple[int, bytes, Optional[str]]]:
+        """Return the cached status, body and encoding of a recently fetched page"""
+        try:
+            with self._page_cache_lock:
+                row = self._open_page_cache().execute(
+                    'SELECT status, body, encoding FROM pages WHERE url = ? AND fetched > ?',
+                    (url, (datetime.now() - _PAGE_CACHE_TTL).isoformat())
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error reading page cache: {e}")
+            return None
+        return (row[0], bytes(row[1]), row[2]) if row else None
+
+    def cache_page(self, url: str, status_code: int, body: bytes, encoding: Optional[str]) -> None:
+        """Store a fetched page; errors and throttling responses are never cached"""
+        if status_code not in _DEFINITE_STATUSES:
+            return
+        try:
+            with self._page_cache_lock:
+                cache = self._open_page_cache()
+                cache.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)',
+                              (url, status_code, body, encoding, datetime.now().isoformat()))
+                cache.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error writing page cache: {e}")
+
+    def _iter_codes(self) -> Iterator[str]:
+        """Lazily yield possible promo codes based on observed patterns"""
+        for prefix in self._PREFIXES:
+            for i in range(100):
+                yield f"{prefix}{i:02}"
+
     def generate_promo_codes(self) -> List[str]:
         """Generate possible promo codes based on observed patterns"""
-        codes = [f"{i:02}" for i in range(100)]
-        prefixes = ["AS23", "CS23", "AS24", "CS24", "AS25", "CS25"]
-        all_codes = []
-        for prefix in prefixes:
-            for code in codes:
-                all_codes.append(f"{prefix}{code}")
-        return all_codes
-
-    def extract_company_name(self, html_content: str) -> Optional[str]:
-        """Extract company/university name from HTML content"""
+        return list(self._iter_codes())
+
+    def parse_html(self, html_content: str, scripts_only: bool = False):
+        """Parse HTML content with selectolax if available, else BeautifulSoup
+
+        With scripts_only, BeautifulSoup builds a tree holding only the JSON
+        data scripts, which is all get_json_scripts needs.
+        """
+        if HTMLParser is not None:
+            return HTMLParser(html_content)
+        return BeautifulSoup(html_content, 'lxml', parse_only=_SCRIPT_STRAINER if scripts_only else None)
+
+    def get_json_scripts(self, soup) -> List[Union[str, bytes]]:
+        """Return the contents of all application/json script tags"""
+        if HTMLParser is not None:
+            return [node.text() for node in soup.css('script[type="application/json"]')]
+        return [script.encode_contents() for script in soup.find_all('script', {'type': 'application/json'})]
+
+    def find_json_scripts(self, body: bytes, encoding: Optional[str] = None) -> List[Union[str, bytes]]:
+        """Return the JSON data scripts of a page, parsing HTML only if needed"""
+        # Next.js pages keep their data in a single __NEXT_DATA__ script,
+        # which can be cut straight out of the bytes without building a DOM
+        next_data = _NEXT_DATA_RE.search(body)
+        if next_data:
+            return [next_data.group(1)]
+        
+        html_content = body.decode(encoding or 'utf-8', errors='replace')
+        return self.get_json_scripts(self.parse_html(html_content, scripts_only=True))
+
+    def get_text(self, body: bytes, encoding: Optional[str] = None) -> str:
+        """Return the lowercased text of a page by stripping its markup"""
+        text = _TAG_RE.sub(b' ', _NON_TEXT_RE.sub(b' ', body))
+        # Decoded before matching so \w and IGNORECASE cover non-ASCII names
+        return html.unescape(text.decode(encoding or 'utf-8', errors='replace')).lower()
+
+    def _extract_page_props(self, body: bytes, encoding: Optional[str] = None) -> Optional[Dict]:
+        """Decode the page data once and return its Next.js pageProps"""
+        for script in self.find_json_scripts(body, encoding):
+            try:
+                data = _json.loads(script)
+                if 'props' in data and 'pageProps' in data['props']:
+                    return data['props']['pageProps']
+            except (_json.JSONDecodeError, ValueError, KeyError, TypeError):
+                continue
+        return None
+
+    def _extract_expiration(self, props: Optional[Dict]) -> Optional[datetime]:
+        """Return the promo end date from pageProps, if it has a valid one"""
+        end_date = ((props or {}).get('promo_data') or {}).get('end_date')
+        if end_date:
+            try:
+                return datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            except ValueError:
+                pass
+        return None
+
+    def extract_company_name(self, props: Optional[Dict], body: Optional[bytes] = None,
+                             encoding: Optional[str] = None) -> Optional[str]:
+        """Extract company/university name from pageProps, else from the raw HTML text"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Method 1: Look for company_name in the page data
+            if props:
+                company_name = (props.get('content') or {}).get('company_name')
+                if company_name:
+                    return company_name
+                
+                # Also check promo_data
+                company_name = (props.get('promo_data') or {}).get('company_name')
+                if company_name:
+                    return company_name
             
-            # Method 1: Look for company_name in script data
-            scripts = soup.find_all('script', {'type': 'application/json'})
-            for script in scripts:
-                try:
-                    data = json.loads(script.string)
-                    if 'props' in data and 'pageProps' in data['props']:
-                        content = data['props']['pageProps'].get('content', {})
-                        company_name = content.get('company_name')
-                        if company_name:
-                            return company_name
-                        
-                        # Also check promo_data
-                        promo_data = data['props']['pageProps'].get('promo_data', {})
-                        company_name = promo_data.get('company_name')
-                        if company_name:
-                            return company_name
-                except (json.JSONDecodeError, KeyError):
-                    continue
+            if body is None:
+                return None
             
-            # Method 2: Look for email validation patterns
-            email_patterns = [
-                r'@(\w+)\.edu',
-                r'@(\w+)\.com',
-                r'@(\w+)\.org',
-                r'university\s+of\s+(\w+)',
-                r'(\w+)\s+university'
-            ]
+            # Only strip the page down to text once the JSON data came up empty
+            text_content = self.get_text(body, encoding)
             
-            text_content = soup.get_text().lower()
-            for pattern in email_patterns:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
+            # Method 2: Look for email validation patterns
+            for pattern in _EMAIL_PATTERNS:
+                matches = pattern.findall(text_content)
                 if matches:
                     return matches[0].title()
             
             # Method 3: Look for specific text patterns
-            company_indicators = [
-                r'Only.*?members who work at ([^,]+)',
-                r'([^,]+) discover a quicker way',
-                r'([^,]+) employees',
-                r'([^,]+) staff'
-            ]
-            
-            for pattern in company_indicators:
-                matches = re.findall(pattern, text_content, re.IGNORECASE)
+            for pattern in _COMPANY_INDICATORS:
+                matches = pattern.findall(text_content)
                 if matches:
                     return matches[0].strip().title()
                     
@@ -131,129 +378,382 @@ class AlaskaPromoFinder:
             
         return None
 
+    def process_response(self, promo_code: str, url: str, status_code: int, body: bytes,
+                         encoding: Optional[str] = None) -> Optional[Dict]:
+        """Extract promo information from a fetched promo page"""
+        if status_code == 200:
+            # Check if it's a valid promo page (not a generic error page) on the
+            # raw bytes, so generic pages are never decoded or parsed
+            if _PROMO_PAGE_MARKER_RE.search(body):
+                # Decode the page data once and share it between extractors
+                props = self._extract_page_props(body, encoding)
+                company_name = self.extract_company_name(props, body, encoding)
+                
+                # Check if the promotion is expired
+                status = 'active'
+                expiration_info = None
+                
+                # Check for explicit expiration messages
+                if _EXPIRED_MARKER_RE.search(body):
+                    status = 'expired'
+                    # Try to extract expiration date from the text
+                    expiration_match = _EXPIRATION_RE.search(body)
+                    if expiration_match:
+                        expiration_info = expiration_match.group(1).decode('ascii')
+                
+                # Also check JSON data for end_date
+                try:
+                    end_datetime = self._extract_expiration(props)
+                    # Check if end date is in the past
+                    if end_datetime and end_datetime < datetime.now().astimezone():
+                        status = 'expired'
+                        if not expiration_info:
+                            expiration_info = end_datetime.strftime('%m/%d/%Y')
+                except Exception:
+                    pass
+                
+                result = {
+                    'promo_code': promo_code,
+                    'url': url,
+                    'company_name': company_name,
+                    'found_date': datetime.now().isoformat(),
+                    'status': status  # Now properly set to 'expired' when detected
+                }
+                
+                if expiration_info:
+                    result['expiration_date'] = expiration_info
+                
+                status_emoji = "⏰" if status == 'expired' else "✅"
+                status_text = f"({status.upper()})" if status == 'expired' else ""
+                self.logger.info(f"{status_emoji} Found: {promo_code} - {company_name or 'Unknown Company'} {status_text}")
+                return result
+            else:
+                self.logger.debug(f"❌ {promo_code} - Not a valid promo page")
+        else:
+            self.logger.debug(f"❌ {promo_code} - HTTP {status_code}")
+        
+        return None
+
+    def update_backoff(self, status_code: int) -> None:
+        """Adapt the request delay: double it when throttled, ease back towards --delay otherwise"""
+        with self._backoff_lock:
+            if status_code == 429 or status_code >= 500:
+                self._backoff = min(max(10.0, self.delay), max(0.05, self._backoff) * 2)
+            else:
+                self._backoff = max(self.delay, self._backoff * 0.9)
+
+    def reserve_request_slot(self) -> float:
+        """Reserve the next request start and return how long to wait for it
+
+        Starts are spaced by the adaptive delay across all workers, so the
+        overall request rate does not grow with the concurrency.
+        """
+        with self._backoff_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_at)
+            self._next_request_at = slot + self._backoff * random.uniform(0.8, 1.2)
+            return slot - now
+
+    def is_complete_preview(self, headers, preview: bytes) -> bool:
+        """Check whether a ranged preview already holds the whole page"""
+        # Content-Range looks like "bytes 0-32767/45000"
+        total = headers.get('Content-Range', '').rpartition('/')[2]
+        return total.isdigit() and int(total) == len(preview)
+
+    def fetch_page(self, url: str) -> Tuple[int, bytes, Optional[str]]:
+        """Fetch a promo page, downloading it in full only if it may be a promo"""
+        # Fetch only the start of the page first; most codes return a
+        # generic page that can be rejected without downloading it all
+        response = self.session.get(url, timeout=10, headers={'Range': f'bytes=0-{_PREVIEW_BYTES - 1}'})
+        self.update_backoff(response.status_code)
+        if response.status_code != 206:
+            # The server ignored the range and sent the whole page
+            return response.status_code, response.content, response.encoding
+        
+        body = response.content
+        if not self.is_complete_preview(response.headers, body) and _PROMO_PAGE_MARKER_RE.search(body):
+            # Only the rest of a promo page is worth downloading
+            rest = self.session.get(url, timeout=10, headers={'Range': f'bytes={len(body)}-'})
+            self.update_backoff(rest.status_code)
+            if rest.status_code != 206:
+                return rest.status_code, rest.content, rest.encoding
+            body += rest.content
+        
+        return 200, body, response.encoding
+
+    async def fetch_page_async(self, session: 'aiohttp.ClientSession', url: str) -> Tuple[int, bytes, Optional[str]]:
+        """Asynchronously fetch a promo page (see fetch_page)"""
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10),
+                               headers={'Range': f'bytes=0-{_PREVIEW_BYTES - 1}'}) as response:
+            body = await response.read()
+            self.update_backoff(response.status)
+            if response.status != 206:
+                return response.status, body, response.charset
+            complete = self.is_complete_preview(response.headers, body)
+            encoding = response.charset
+        
+        if not complete and _PROMO_PAGE_MARKER_RE.search(body):
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10),
+                                   headers={'Range': f'bytes={len(body)}-'}) as response:
+                rest = await response.read()
+                self.update_backoff(response.status)
+                if response.status != 206:
+                    return response.status, rest, response.charset
+                body += rest
+        
+        return 200, body, encoding
+
     def check_promo_url(self, promo_code: str) -> Optional[Dict]:
         """Check if a promo URL exists and extract information"""
+        return self._check_promo_url(promo_code)[0]
+
+    def _check_promo_url(self, promo_code: str) -> Tuple[Optional[Dict], bool]:
+        """Check a promo URL and whether the answer is definite, i.e. not an error or throttling"""
+        url = urljoin(self.base_url, promo_code)
+        
+        page = self.get_cached_page(url)
+        if page is None:
+            # Rate limiting, shared by all workers and adapted to the server
+            time.sleep(self.reserve_request_slot())
+            try:
+                page = self.fetch_page(url)
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"❌ {promo_code} - Request failed: {e}")
+                return None, False
+            self.cache_page(url, *page)
+        
+        return self.process_response(promo_code, url, *page), page[0] in _DEFINITE_STATUSES
+
+    async def check_promo_url_async(self, session: 'aiohttp.ClientSession', promo_code: str) -> Optional[Dict]:
+        """Asynchronously check if a promo URL exists and extract information"""
+        return (await self._check_promo_url_async(session, promo_code))[0]
+
+    async def _check_promo_url_async(self, session: 'aiohttp.ClientSession',
+                                     promo_code: str) -> Tuple[Optional[Dict], bool]:
+        """Asynchronously check a promo URL and whether the answer is definite (see _check_promo_url)"""
         url = urljoin(self.base_url, promo_code)
         
+        page = self.get_cached_page(url)
+        if page is None:
+            # Rate limiting, shared by all workers and adapted to the server
+            await asyncio.sleep(self.reserve_request_slot())
+            try:
+                page = await self.fetch_page_async(session, url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error(f"❌ {promo_code} - Request failed: {e}")
+                return None, False
+            self.cache_page(url, *page)
+        
+        return self.process_response(promo_code, url, *page), page[0] in _DEFINITE_STATUSES
+
+    def load_prefix_cache(self) -> Dict[str, Dict]:
+        """Load the liveness verdicts from earlier prefix probes"""
+        if os.path.exists(self.prefix_cache_file):
+            try:
+                with open(self.prefix_cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error loading prefix cache: {e}")
+        return {}
+
+    def save_prefix_cache(self, cache: Dict[str, Dict]) -> None:
+        """Save prefix liveness verdicts for future runs"""
         try:
-            response = self.session.get(url, timeout=10)
+            with open(self.prefix_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except Exception as e:
+            self.logger.error(f"Error saving prefix cache: {e}")
+
+    def _plan_prefix_probes(self, prunable: Set[str], cache: Dict[str, Dict]) -> Tuple[Set[str], Dict[str, List[str]]]:
+        """Split the prunable prefixes into cached-dead ones and ones that need probing"""
+        dead: Set[str] = set()
+        probes: Dict[str, List[str]] = {}
+        
+        for prefix in sorted(prunable):
+            # A prefix with a known promo is alive without probing
+            if any(code.startswith(prefix) for code in self.results):
+                continue
             
-            if response.status_code == 200:
-                # Check if it's a valid promo page (not a generic error page)
-                if 'fast track' in response.text.lower() or 'mileage plan' in response.text.lower():
-                    company_name = self.extract_company_name(response.text)
-                    
-                    # Check if the promotion is expired
-                    status = 'active'
-                    expiration_info = None
-                    
-                    # Check for explicit expiration messages
-                    if 'promotion ended' in response.text.lower() or 'expired' in response.text.lower():
-                        status = 'expired'
-                        # Try to extract expiration date from the text
-                        expiration_match = re.search(r'promotion ended.*?on\s+(\d{1,2}/\d{1,2}/\d{4})', response.text, re.IGNORECASE)
-                        if expiration_match:
-                            expiration_info = expiration_match.group(1)
-                    
-                    # Also check JSON data for end_date
-                    try:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        scripts = soup.find_all('script', {'type': 'application/json'})
-                        for script in scripts:
-                            try:
-                                data = json.loads(script.string)
-                                if 'props' in data and 'pageProps' in data['props']:
-                                    promo_data = data['props']['pageProps'].get('promo_data', {})
-                                    end_date = promo_data.get('end_date')
-                                    if end_date:
-                                        # Check if end date is in the past
-                                        try:
-                                            end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                                            if end_datetime < datetime.now().astimezone():
-                                                status = 'expired'
-                                                if not expiration_info:
-                                                    expiration_info = end_datetime.strftime('%m/%d/%Y')
-                                        except ValueError:
-                                            pass
-                            except (json.JSONDecodeError, KeyError):
-                                continue
-                    except Exception:
-                        pass
-                    
-                    result = {
-                        'promo_code': promo_code,
-                        'url': url,
-                        'company_name': company_name,
-                        'found_date': datetime.now().isoformat(),
-                        'status': status  # Now properly set to 'expired' when detected
-                    }
-                    
-                    if expiration_info:
-                        result['expiration_date'] = expiration_info
-                    
-                    status_emoji = "⏰" if status == 'expired' else "✅"
-                    status_text = f"({status.upper()})" if status == 'expired' else ""
-                    self.logger.info(f"{status_emoji} Found: {promo_code} - {company_name or 'Unknown Company'} {status_text}")
-                    return result
-                else:
-                    self.logger.debug(f"❌ {promo_code} - Not a valid promo page")
+            entry = cache.get(prefix)
+            if entry and datetime.now() - datetime.fromisoformat(entry['checked']) < _PREFIX_CACHE_TTL:
+                if not entry['alive']:
+                    dead.add(prefix)
             else:
-                self.logger.debug(f"❌ {promo_code} - HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"❌ {promo_code} - Request failed: {e}")
+                probes[prefix] = [f"{prefix}{i:02}" for i in _PREFIX_PROBES]
         
-        return None
+        return dead, probes
+
+    def _record_prefix_probe(self, prefix: str, results: List[Tuple[str, Optional[Dict], bool]],
+                             cache: Dict[str, Dict], dead: Set[str], checked: Set[str]) -> int:
+        """Store the hits from a prefix's sample codes and cache its verdict
+
+        A prefix is only judged dead when every sample definitely held no
+        promo; if any failed or was throttled it stays unpruned and uncached.
+        """
+        found_count = 0
+        for code, result, definite in results:
+            if result:
+                self.add_result(code, result)
+                self.append_result(result)
+                found_count += 1
+            if definite:
+                checked.add(code)
+        
+        if found_count or all(definite for _, _, definite in results):
+            cache[prefix] = {'alive': bool(found_count), 'checked': datetime.now().isoformat()}
+            if not found_count:
+                dead.add(prefix)
+        else:
+            self.logger.warning(f"Not pruning prefix {prefix}: some sample codes could not be checked")
+        return found_count
+
+    def _apply_prefix_verdicts(self, codes: List[str], dead: Set[str], checked: Set[str],
+                               cache: Dict[str, Dict]) -> List[str]:
+        """Drop codes of dead prefixes and codes already checked as probes"""
+        for prefix in sorted(dead):
+            self.logger.info(f"Skipping prefix {prefix}: no promos at sample codes")
+        
+        self.save_prefix_cache(cache)
+        return [code for code in codes if code[:4] not in dead and code not in checked]
+
+    async def _prune_dead_prefixes(self, check, codes: List[str], prunable: Set[str]) -> Tuple[List[str], int]:
+        """Drop codes whose prefix shows no promos at a few sample codes"""
+        cache = self.load_prefix_cache()
+        dead, probes = self._plan_prefix_probes(prunable, cache)
+        
+        found_count = 0
+        checked: Set[str] = set()
+        for prefix, probe_codes in probes.items():
+            results = await asyncio.gather(*(check(code, f"[probe {prefix}]") for code in probe_codes))
+            found_count += self._record_prefix_probe(prefix, results, cache, dead, checked)
+        
+        return self._apply_prefix_verdicts(codes, dead, checked, cache), found_count
+
+    async def _search_async(self, codes: List[str], prunable: Set[str]) -> int:
+        """Check codes concurrently and store hits as they complete"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            async def check(code: str, progress: str):
+                async with semaphore:
+                    self.logger.info(f"{progress} Checking {code}...")
+                    return (code, *await self._check_promo_url_async(session, code))
+            
+            found_count = 0
+            if prunable:
+                codes, found_count = await self._prune_dead_prefixes(check, codes, prunable)
+            
+            self.logger.info(f"Searching {len(codes)} promo codes...")
+            
+            tasks = [check(code, f"[{i+1}/{len(codes)}]") for i, code in enumerate(codes)]
+            for task in asyncio.as_completed(tasks):
+                code, result, _ = await task
+                if result:
+                    self.add_result(code, result)
+                    self.append_result(result)
+                    found_count += 1
+        
+        return found_count
+
+    def _search_threaded(self, codes: List[str], prunable: Set[str]) -> int:
+        """Check codes on a thread pool over the shared requests session"""
+        def check(code: str, progress: str):
+            self.logger.info(f"{progress} Checking {code}...")
+            return (code, *self._check_promo_url(code))
+        
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            try:
+                found_count = 0
+                if prunable:
+                    cache = self.load_prefix_cache()
+                    dead, probes = self._plan_prefix_probes(prunable, cache)
+                    checked: Set[str] = set()
+                    for prefix, probe_codes in probes.items():
+                        results = list(executor.map(lambda code: check(code, f"[probe {prefix}]"), probe_codes))
+                        found_count += self._record_prefix_probe(prefix, results, cache, dead, checked)
+                    codes = self._apply_prefix_verdicts(codes, dead, checked, cache)
+            
+                self.logger.info(f"Searching {len(codes)} promo codes...")
+            
+                # Results are only stored from this thread, as futures complete
+                futures = [executor.submit(check, code, f"[{i+1}/{len(codes)}]") for i, code in enumerate(codes)]
+                for future in as_completed(futures):
+                    code, result, _ = future.result()
+                    if result:
+                        self.add_result(code, result)
+                        self.append_result(result)
+                        found_count += 1
+            except BaseException:
+                # Leaving the with block waits for every queued check, so drop
+                # them first, e.g. on Ctrl-C
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        return found_count
 
     def search_promos(self, max_codes: Optional[int] = None, start_from: Optional[str] = None) -> None:
         """Search for promo codes"""
-        codes = self.generate_promo_codes()
+        codes = self._iter_codes()
         
         if start_from:
-            try:
-                start_index = codes.index(start_from)
-                codes = codes[start_index:]
+            if start_from in self._iter_codes():
+                codes = itertools.dropwhile(lambda code: code != start_from, codes)
                 self.logger.info(f"Starting from code: {start_from}")
-            except ValueError:
+            else:
                 self.logger.warning(f"Start code {start_from} not found, starting from beginning")
         
-        if max_codes:
-            codes = codes[:max_codes]
+        codes = list(itertools.islice(codes, max_codes or None))
         
-        self.logger.info(f"Searching {len(codes)} promo codes...")
+        # Only prefixes the window covers completely may be pruned, so probes
+        # stay inside it and the requested start code is always checked
+        prunable: Set[str] = set()
+        if self.prune_prefixes:
+            window = Counter(code[:4] for code in codes)
+            prunable = {prefix for prefix, count in window.items()
+                        if count == 100 and not (start_from and start_from.startswith(prefix))}
         
-        found_count = 0
-        for i, code in enumerate(codes):
-            # Skip if already checked
-            if code in self.results:
-                continue
-                
-            self.logger.info(f"[{i+1}/{len(codes)}] Checking {code}...")
-            
-            result = self.check_promo_url(code)
-            if result:
-                self.results[code] = result
-                found_count += 1
-                
-                # Save results periodically
-                if found_count % 5 == 0:
-                    self.save_results()
-            
-            # Rate limiting
-            time.sleep(random.uniform(0.5, 1.5) * self.delay)
+        # Skip if already checked, so progress reflects the real work
+        codes = [code for code in codes if code not in self.results]
+        
+        # Hits are journaled as they arrive; the full file is written once at the end
+        self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        try:
+            if self.use_threads:
+                found_count = self._search_threaded(codes, prunable)
+            else:
+                found_count = asyncio.run(self._search_async(codes, prunable))
+        finally:
+            self._journal.close()
+            self._journal = None
         
         self.save_results()
         self.logger.info(f"Search complete! Found {found_count} new promos")
 
     def search_by_company(self, company_query: str) -> List[Dict]:
         """Search for promos by company name"""
-        matches = []
         query_lower = company_query.lower()
         
-        for code, data in self.results.items():
-            if data.get('company_name'):
-                if query_lower in data['company_name'].lower():
-                    matches.append(data)
+        # A query word can only match inside a single name token, so intersect
+        # the postings of every index token containing each query word
+        candidates: Optional[Set[str]] = None
+        for word in query_lower.split():
+            postings = {code for token, codes in self._company_index.items() if word in token for code in codes}
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        
+        if candidates is None:
+            candidates = {code for codes in self._company_index.values() for code in codes}
+        
+        # Confirm the full query (including spacing) against each candidate
+        matches = []
+        for code in sorted(candidates):
+            data = self.results[code]
+            if data.get('company_name') and query_lower in data['company_name'].lower():
+                matches.append(data)
         
         return matches
 
@@ -267,7 +767,8 @@ class AlaskaPromoFinder:
         print(f"{'Code':<8} {'Company':<35} {'Status':<12} {'URL'}")
         print("-" * 95)
         
-        for code, data in sorted(self.results.items()):
+        for code in self._sorted_codes:
+            data = self.results[code]
             company = data.get('company_name', 'Unknown')[:33]
             status = data.get('status', 'unknown')
             status_display = "⏰ EXPIRED" if status == 'expired' else "✅ ACTIVE"
@@ -281,12 +782,16 @@ def main():
     parser.add_argument('--list', action='store_true', help='List all found promos')
     parser.add_argument('--max-codes', type=int, help='Maximum number of codes to check')
     parser.add_argument('--start-from', type=str, help='Start searching from specific code')
-    parser.add_argument('--delay', type=float, default=1.0, help='Delay between requests (seconds)')
-    parser.add_argument('--results-file', type=str, default='alaska_promos.json', help='Results file')
+    parser.add_argument('--delay', type=float, default=1.0, help='Minimum delay between requests across all workers (seconds); grows while the server is throttling')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum number of concurrent requests')
+    parser.add_argument('--threads', action='store_true', help='Use a thread pool instead of asyncio (the default when aiohttp is not installed)')
+    parser.add_argument('--no-prune', action='store_true', help='Sweep every prefix instead of skipping ones with no promos at sample codes')
+    parser.add_argument('--results-file', type=str, default='alaska_promos.json', help='Results file (gzip-compressed if it ends in .gz)')
     
     args = parser.parse_args()
     
-    finder = AlaskaPromoFinder(results_file=args.results_file, delay=args.delay)
+    finder = AlaskaPromoFinder(results_file=args.results_file, delay=args.delay, concurrency=args.concurrency,
+                               prune_prefixes=not args.no_prune, use_threads=args.threads)
     
     if args.search:
         finder.search_promos(max_codes=args.max_codes, start_from=args.start_from)